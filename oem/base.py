@@ -70,6 +70,8 @@ class KeyValueSection(object):
 class Constraint(object):
     """Base constraint type."""
 
+    __slots__ = ()
+
     def apply(self, obj):
         """Apply constraint.
 
@@ -83,6 +85,8 @@ class Constraint(object):
 class ConstraintSpecification(object):
     """Base constraint group type."""
 
+    __slots__ = ("constraints",)
+
     def __init__(self, *constraints):
         self.constraints = constraints
 
@@ -164,8 +164,11 @@ class SegmentCompare(object):
         Yields:
             state_compare: Sampled StateCompare.
         """
-        for epoch in time_range(*self._span, step_size):
-            yield self(epoch)
+        epochs = time_range(*self._span, step_size)
+        for origin, target in zip(
+            self._origin._sample_states(epochs), self._target._sample_states(epochs)
+        ):
+            yield target - origin
 
     @property
     def is_empty(self):
@@ -1,3 +1,5 @@
+import sys
+
 from lxml.etree import SubElement
 
 from oem import CURRENT_VERSION
@@ -15,6 +17,7 @@ from oem.tools import (
 class ConstrainMetaDataTime(Constraint):
     """Apply constraints to metadata START_TIME and STOP_TIME"""
 
+    __slots__ = ()
     versions = ["*"]
 
     def func(self, metadata):
@@ -29,6 +32,7 @@ class ConstrainMetaDataTime(Constraint):
 class ConstrainMetadataUseableTime(Constraint):
     """Apply constraints to USEABLE_START_TIME & USEABLE_STOP_TIME"""
 
+    __slots__ = ()
     versions = ["*"]
 
     def func(self, metadata):
@@ -58,6 +62,7 @@ class ConstrainMetadataUseableTime(Constraint):
 class ConstrainMetaDataInterpolation(Constraint):
     """Apply constraints to metadata INTERPOLATION and INTERPOLATION_DEGREE"""
 
+    __slots__ = ()
     versions = ["*"]
 
     def func(self, metadata):
@@ -72,6 +77,7 @@ class ConstrainMetaDataInterpolation(Constraint):
 class ConstrainMetaDataRefFrameEpoch(Constraint):
     """Apply constraints to metadata REF_FRAME_EPOCH"""
 
+    __slots__ = ()
     versions = ["1.0"]
 
     def func(self, metadata):
@@ -84,6 +90,7 @@ class ConstrainMetaDataRefFrameEpoch(Constraint):
 class ConstrainMetaDataMessageId(Constraint):
     """Apply constraints to metadata MESSAGE_ID"""
 
+    __slots__ = ()
     versions = ["1.0", "2.0"]
 
     def func(self, metadata):
@@ -135,9 +142,17 @@ class MetaDataSection(KeyValueSection):
         ConstrainMetaDataRefFrameEpoch,
         ConstrainMetaDataMessageId,
     )
+    _interned_keys = (
+        "OBJECT_NAME",
+        "OBJECT_ID",
+        "CENTER_NAME",
+        "REF_FRAME",
+        "TIME_SYSTEM",
+    )
 
     def __init__(self, metadata, version=CURRENT_VERSION):
         self.version = version
+        self._useable_span = None
         self._parse_fields(metadata)
         self._constraint_spec.apply(self)
 
@@ -148,6 +163,10 @@ class MetaDataSection(KeyValueSection):
             and all(self[key] == other[key] for key in self)
         )
 
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._useable_span = None
+
     def __repr__(self):
         start = str(self.useable_start_time)
         stop = str(self.useable_stop_time)
@@ -155,6 +174,14 @@ class MetaDataSection(KeyValueSection):
 
     @classmethod
     def _from_raw_data(cls, segment, version):
+        segment = {
+            sys.intern(key): (
+                sys.intern(value)
+                if key in cls._interned_keys and isinstance(value, str)
+                else value
+            )
+            for key, value in segment.items()
+        }
         return cls(segment, version=version)
 
     def _to_string(self):
@@ -174,17 +201,27 @@ class MetaDataSection(KeyValueSection):
     @property
     def useable_start_time(self):
         """Return epoch of start of useable state data range"""
-        return (
-            self["USEABLE_START_TIME"]
-            if "USEABLE_START_TIME" in self
-            else self["START_TIME"]
-        )
+        return self._get_useable_span()[0]
 
     @property
     def useable_stop_time(self):
         """Return epoch of end of useable state data range"""
-        return (
-            self["USEABLE_STOP_TIME"]
-            if "USEABLE_STOP_TIME" in self
-            else self["STOP_TIME"]
-        )
+        return self._get_useable_span()[1]
+
+    def _get_useable_span(self):
+        # Parsed epochs are cached until the next metadata change, since
+        # segment lookups compare against them repeatedly.
+        if self._useable_span is None:
+            self._useable_span = (
+                (
+                    self["USEABLE_START_TIME"]
+                    if "USEABLE_START_TIME" in self
+                    else self["START_TIME"]
+                ),
+                (
+                    self["USEABLE_STOP_TIME"]
+                    if "USEABLE_STOP_TIME" in self
+                    else self["STOP_TIME"]
+                ),
+            )
+        return self._useable_span
@@ -1,5 +1,4 @@
-from itertools import chain
-
+import numpy as np
 from lxml.etree import SubElement
 
 from oem import CURRENT_VERSION
@@ -11,6 +10,8 @@ from oem.interp import EphemerisInterpolator
 from oem.parsers import COV_XML_KEYS
 from oem.tools import (
     _bulk_parse_epochs,
+    _epochs_equal,
+    _format_epochs,
     epoch_span_contains,
     format_epoch,
     format_float,
@@ -22,6 +23,7 @@ from oem.tools import (
 class ConstrainEphemerisSegmentCovariance(Constraint):
     """Apply constraints to ephemeris segment covariance sections"""
 
+    __slots__ = ()
     versions = ["1.0"]
 
     def func(self, ephemeris_segment):
@@ -34,6 +36,7 @@ class ConstrainEphemerisSegmentCovariance(Constraint):
 class ConstrainEphemerisSegmentStateVectors(Constraint):
     """Apply constraints to ephemeris segment state vectors"""
 
+    __slots__ = ()
     versions = ["1.0"]
 
     def func(self, ephemeris_segment):
@@ -53,7 +56,7 @@ def _process_states(metadata, raw_data_rows):
     sorted = all(epochs[idx] < epochs[idx + 1] for idx in range(len(epochs) - 1))
     require(sorted, "States in data section are not ordered by epoch")
 
-    epochs = tuple(_bulk_parse_epochs(raw_data_columns[0], metadata))
+    epochs = _bulk_parse_epochs(raw_data_columns[0], metadata)
     return (epochs, *raw_data_columns[1:])
 
 
@@ -82,7 +85,8 @@ class EphemerisSegment(object):
     ):
         self.version = version
         self.metadata = metadata
-        self._state_data = state_data
+        self._epochs, *vectors = state_data
+        self._vectors = np.array(vectors, dtype=float)
         self._covariance_data = covariance_data
         self._constraint_spec.apply(self)
         self._interpolator = None
@@ -110,10 +114,13 @@ class EphemerisSegment(object):
         return self.states
 
     def __eq__(self, other):
+        # Numeric columns are compared before the epochs so that differing
+        # segments exit before any element-wise Time comparisons.
         return (
             self.version == other.version
             and self.metadata == other.metadata
-            and self._state_data == other._state_data
+            and np.array_equal(self._vectors, other._vectors)
+            and _epochs_equal(self._epochs, other._epochs)
             and self._covariance_data == other._covariance_data
         )
 
@@ -146,8 +153,8 @@ class EphemerisSegment(object):
 
     def _to_string(self):
         lines = self.metadata._to_string() + "\n"
-        for epoch, *state in zip(*self._state_data):
-            lines += f"{format_epoch(epoch)} "
+        for epoch, state in zip(_format_epochs(self._epochs), self._vectors.T):
+            lines += f"{epoch} "
             lines += " ".join(format_float(entry) for entry in state) + "\n"
         lines += "\n"
 
@@ -172,9 +179,9 @@ class EphemerisSegment(object):
         self.metadata._to_xml(SubElement(parent, "metadata"))
         data = SubElement(parent, "data")
         fields = ("X", "Y", "Z", "X_DOT", "Y_DOT", "Z_DOT")
-        for epoch, *state in zip(*self._state_data):
+        for epoch, state in zip(_format_epochs(self._epochs), self._vectors.T):
             vector = SubElement(data, "stateVector")
-            SubElement(vector, "EPOCH").text = format_epoch(epoch)
+            SubElement(vector, "EPOCH").text = epoch
             for idx, field in enumerate(fields):
                 SubElement(vector, field).text = format_float(state[idx])
             if len(state) == 9:
@@ -197,13 +204,35 @@ class EphemerisSegment(object):
         else:
             method = "LAGRANGE"
             order = 5
-        self._interpolator = EphemerisInterpolator(self._state_data, method, order)
+        self._interpolator = EphemerisInterpolator(
+            (self._epochs, *self._vectors), method, order
+        )
+
+    def _sample(self, epochs):
+        if not self._interpolator:
+            self._init_interpolator()
+        return self._interpolator.sample(epochs)
+
+    def _sample_states(self, epochs):
+        positions, velocities, accelerations = self._sample(epochs)
+        for idx, epoch in enumerate(epochs):
+            yield State(
+                epoch,
+                self.metadata["REF_FRAME"],
+                self.metadata["CENTER_NAME"],
+                positions[idx],
+                velocities[idx],
+                acceleration=(
+                    accelerations[idx] if accelerations is not None else None
+                ),
+                version=self.version,
+            )
 
     def copy(self):
         """Create an independent copy of this instance."""
         return EphemerisSegment(
             self.metadata.copy(),
-            self._state_data,
+            (self._epochs, *self._vectors),
             self._covariance_data if self.has_covariance else None,
             version=self.version,
         )
@@ -227,10 +256,8 @@ class EphemerisSegment(object):
             ...    for state in segment.steps(60):
             ...        pass
         """
-        for epoch in time_range(
-            self.useable_start_time, self.useable_stop_time, step_size
-        ):
-            yield self(epoch)
+        epochs = time_range(self.useable_start_time, self.useable_stop_time, step_size)
+        yield from self._sample_states(epochs)
 
     def resample(self, step_size, in_place=False):
         """Resample ephemeris data.
@@ -247,33 +274,30 @@ class EphemerisSegment(object):
             EphemerisSegment: Resampled EphemerisSegment. Output is
                 an indepdent instance if in_place is True.
         """
-        if not self._interpolator:
-            self._init_interpolator()
-
         epochs = time_range(self.useable_start_time, self.useable_stop_time, step_size)
+        vectors = self._sample(epochs)[: 2 + self.has_accel]
+        state_data = (epochs, *np.hstack(vectors).T)
 
         if in_place:
-            states = (
-                (
-                    epoch,
-                    *chain.from_iterable(
-                        self._interpolator(epoch)[: 2 + self.has_accel]
-                    ),
-                )
-                for epoch in epochs
-            )
-            self._state_data = tuple(zip(*states))
+            self._epochs, *vectors = state_data
+            self._vectors = np.array(vectors)
+            self._interpolator = None
+            segment = self
         else:
-            segment = self.copy().resample(step_size, in_place=True)
-
-        return segment if not in_place else self
+            segment = EphemerisSegment(
+                self.metadata.copy(),
+                state_data,
+                self._covariance_data if self.has_covariance else None,
+                version=self.version,
+            )
+        return segment
 
     @property
     def states(self):
         """Return list of States in this segment."""
         return (
-            State._from_raw_data(entry, self.version, self.metadata)
-            for entry in zip(*self._state_data)
+            State._from_raw_data((epoch, *state), self.version, self.metadata)
+            for epoch, state in zip(self._epochs, self._vectors.T)
         )
 
     @property
@@ -290,7 +314,7 @@ class EphemerisSegment(object):
     @property
     def has_accel(self):
         """Evaluate if segment contains acceleration data."""
-        return len(self._state_data) == 10
+        return len(self._vectors) == 9
 
     @property
     def has_covariance(self):
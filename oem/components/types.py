@@ -31,6 +31,7 @@ COV_XML_ENTRY_MAP = {
 
 
 class ConstrainStateType(Constraint):
+    __slots__ = ()
     versions = ["1.0"]
 
     def func(self, state):
@@ -41,6 +42,7 @@ class ConstrainStateType(Constraint):
 
 
 class ConstrainStateDimension(Constraint):
+    __slots__ = ()
     versions = ["*"]
 
     def func(self, state):
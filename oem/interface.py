@@ -1,50 +1,36 @@
-from lxml.etree import Element, ElementTree, SubElement
+import io
+from itertools import chain
+
+import numpy as np
+from lxml.etree import Element, ElementTree, SubElement, indent, xmlfile
 
 from oem import components
 from oem.base import Constraint, ConstraintSpecification
 from oem.compare import EphemerisCompare
 from oem.parsers import parse_kvn_oem, parse_xml_oem
-from oem.tools import _open, is_kvn, require
+from oem.tools import _is_kvn_stream, _open, _stack_epochs, require
 
 
-class ConstrainOemTimeSystem(Constraint):
-    """Apply constraints to OEM TIME_SYSTEM."""
+class ConstrainOemSegmentMetadata(Constraint):
+    """Apply constraints to OEM TIME_SYSTEM, OBJECT_NAME, and OBJECT_ID."""
 
+    __slots__ = ()
     versions = ["*"]
+    fixed_keys = ("TIME_SYSTEM", "OBJECT_NAME", "OBJECT_ID")
 
     def func(self, oem):
-        time_system = None
-        for segment in oem:
-            if time_system is None:
-                time_system = segment.metadata["TIME_SYSTEM"]
-            else:
-                require(
-                    segment.metadata["TIME_SYSTEM"] == time_system,
-                    "TIME_SYSTEM not fixed in OEM",
-                )
-
-
-class ConstrainOemObject(Constraint):
-    """Apply constraint to OEM OBJECT_NAME and OBJECT_ID."""
-
-    versions = ["*"]
-
-    def func(self, oem):
-        object_name = oem._segments[0].metadata["OBJECT_NAME"]
-        object_id = oem._segments[0].metadata["OBJECT_ID"]
-        for segment in oem:
-            require(
-                segment.metadata["OBJECT_NAME"] == object_name,
-                "OBJECT_NAME not fixed in OEM",
-            )
-            require(
-                segment.metadata["OBJECT_ID"] == object_id, "OBJECT_ID not fixed in OEM"
-            )
+        reference = oem._segments[0].metadata
+        reference = [(key, reference[key]) for key in self.fixed_keys]
+        for segment in oem._segments[1:]:
+            metadata = segment.metadata
+            for key, value in reference:
+                require(metadata[key] == value, f"{key} not fixed in OEM")
 
 
 class ConstrainOemStates(Constraint):
     """Apply constraints to OEM data sections"""
 
+    __slots__ = ()
     versions = ["*"]
 
     def func(self, oem):
@@ -54,28 +40,14 @@ class ConstrainOemStates(Constraint):
             self.v2_0(oem)
 
     def v1_0(self, oem):
-        require(
-            all(
-                (
-                    oem._segments[idx].metadata["STOP_TIME"]
-                    <= oem._segments[idx + 1].metadata["START_TIME"]
-                )
-                for idx in range(len(oem._segments) - 1)
-            ),
-            "Data section state epochs overlap",
-        )
+        starts = _stack_epochs(segment.metadata["START_TIME"] for segment in oem)
+        stops = _stack_epochs(segment.metadata["STOP_TIME"] for segment in oem)
+        require(np.all(stops[:-1] <= starts[1:]), "Data section state epochs overlap")
 
     def v2_0(self, oem):
-        require(
-            all(
-                (
-                    oem._segments[idx].useable_stop_time
-                    <= oem._segments[idx + 1].useable_start_time
-                )
-                for idx in range(len(oem._segments) - 1)
-            ),
-            "Data section state epochs overlap",
-        )
+        starts = _stack_epochs(oem._segment_starts)
+        stops = _stack_epochs(oem._segment_stops)
+        require(np.all(stops[:-1] <= starts[1:]), "Data section state epochs overlap")
 
 
 class OrbitEphemerisMessage(object):
@@ -134,10 +106,17 @@ class OrbitEphemerisMessage(object):
     """
 
     _constraint_spec = ConstraintSpecification(
-        ConstrainOemTimeSystem, ConstrainOemObject, ConstrainOemStates
+        ConstrainOemSegmentMetadata, ConstrainOemStates
+    )
+
+    __slots__ = (
+        "header",
+        "version",
+        "_segments",
+        "__weakref__",
     )
 
-    def __init__(self, header, segments):
+    def __init__(self, header, segments, *, _validated=False):
         """Create an Orbit Ephemeris Message.
 
         Args:
@@ -146,31 +125,29 @@ class OrbitEphemerisMessage(object):
         """
         self.header = header
         self.version = self.header["CCSDS_OEM_VERS"]
-        self._segments = segments
-        self._constraint_spec.apply(self)
+        self._segments = list(segments)
+        if not _validated:
+            self._constraint_spec.apply(self)
 
     def __call__(self, epoch):
-        for segment in self:
-            if epoch in segment:
-                return segment(epoch)
-        else:
+        segment = self._find_segment(epoch)
+        if segment is None:
             raise ValueError(f"Epoch {epoch} not contained in this ephemeris.")
+        return segment(epoch)
 
     def __iter__(self):
         return iter(self._segments)
 
     def __contains__(self, epoch):
-        return any(epoch in segment for segment in self._segments)
+        return self._find_segment(epoch) is not None
 
     def __eq__(self, other):
+        if self is other:
+            return True
         return (
             self.version == other.version
             and self.header == other.header
-            and len(self._segments) == len(other._segments)
-            and all(
-                this_segment == other_segment
-                for this_segment, other_segment in zip(self._segments, other._segments)
-            )
+            and self._segments == other._segments
         )
 
     def __sub__(self, other):
@@ -179,15 +156,20 @@ class OrbitEphemerisMessage(object):
     def __repr__(self):
         return f"OrbitEphemerisMessage(v{self.version})"
 
-    @classmethod
-    def _from_kvn_oem(cls, file_path):
-        with _open(file_path, "rt") as ephem_file:
-            return cls._from_raw_data(parse_kvn_oem(ephem_file))
-
-    @classmethod
-    def _from_xml_oem(cls, file_path):
-        with _open(file_path, "rt") as ephem_file:
-            return cls._from_raw_data(parse_xml_oem(ephem_file))
+    def _find_segment(self, epoch):
+        # Segments are ordered and non-overlapping, so the first segment
+        # ending at or after the epoch is the only candidate.
+        low, high = 0, len(self._segments)
+        while low < high:
+            mid = (low + high) // 2
+            if self._segments[mid].useable_stop_time < epoch:
+                low = mid + 1
+            else:
+                high = mid
+        if low < len(self._segments):
+            segment = self._segments[low]
+            if segment.useable_start_time <= epoch:
+                return segment
 
     @classmethod
     def _from_raw_data(cls, data):
@@ -211,11 +193,12 @@ class OrbitEphemerisMessage(object):
         Returns:
             OrbitEphemerisMessage: New OEM instance.
         """
-        if is_kvn(file_path):
-            oem = cls._from_kvn_oem(file_path)
-        else:
-            oem = cls._from_xml_oem(file_path)
-        return oem
+        with _open(file_path, "rt") as ephem_file:
+            if _is_kvn_stream(ephem_file):
+                data = parse_kvn_oem(ephem_file)
+            else:
+                data = parse_xml_oem(ephem_file)
+        return cls._from_raw_data(data)
 
     @classmethod
     def convert(cls, in_file_path, out_file_path, file_format):
@@ -235,7 +218,9 @@ class OrbitEphemerisMessage(object):
     def copy(self):
         """Create an independent copy of this instance."""
         return OrbitEphemerisMessage(
-            self.header.copy(), [segment.copy() for segment in self]
+            self.header.copy(),
+            [segment.copy() for segment in self],
+            _validated=True,
         )
 
     def steps(self, step_size):
@@ -266,9 +251,8 @@ class OrbitEphemerisMessage(object):
             ...    for state in segment.steps(60):
             ...        pass
         """
-        for segment in self:
-            for state in segment.steps(step_size):
-                yield state
+        for segment in self._segments:
+            yield from segment.steps(step_size)
 
     def resample(self, step_size, in_place=False):
         """Resample ephemeris data.
@@ -303,9 +287,14 @@ class OrbitEphemerisMessage(object):
         if in_place:
             for segment in self:
                 segment.resample(step_size, in_place=True)
+            oem = self
         else:
-            oem = self.copy().resample(step_size, in_place=True)
-        return oem if not in_place else self
+            oem = OrbitEphemerisMessage(
+                self.header.copy(),
+                [segment.resample(step_size) for segment in self],
+                _validated=True,
+            )
+        return oem
 
     def save_as(self, file_path, file_format="kvn", compression=None):
         """Write OEM to file.
@@ -317,21 +306,61 @@ class OrbitEphemerisMessage(object):
         """
         with _open(file_path, "wb", compression) as output_file:
             if file_format == "kvn":
-                output_file.write(bytes(self._to_kvn_oem(), "utf-8"))
+                with io.TextIOWrapper(
+                    output_file, encoding="utf-8", newline=""
+                ) as text_file:
+                    self._write_kvn(text_file)
             elif file_format == "xml":
-                self._to_xml_oem().write(
-                    output_file,
-                    pretty_print=True,
-                    encoding="utf-8",
-                    xml_declaration=True,
-                )
+                self._write_xml(output_file)
             else:
                 raise ValueError(f"Unrecognized file type: '{file_format}'")
 
+    def iter_states(self):
+        """Iterate through the states in all segments.
+
+        Unlike the `states` property, this does not build a list of all
+        states up front, which is preferable for streaming large ephemerides.
+
+        Returns:
+            iterator: Iterator of State objects.
+        """
+        return chain.from_iterable(segment.states for segment in self)
+
+    def iter_covariances(self):
+        """Iterate through the covariances in all segments.
+
+        Returns:
+            iterator: Iterator of Covariance objects.
+        """
+        return chain.from_iterable(segment.covariances for segment in self)
+
+    def _write_kvn(self, stream):
+        stream.write(self.header._to_string() + "\n")
+        for segment in self._segments:
+            stream.write(segment._to_string())
+
     def _to_kvn_oem(self):
-        lines = self.header._to_string() + "\n"
-        lines += "".join(entry._to_string() for entry in self._segments)
-        return lines
+        stream = io.StringIO()
+        self._write_kvn(stream)
+        return stream.getvalue()
+
+    def _write_xml(self, stream):
+        with xmlfile(stream, encoding="UTF-8") as xml_file:
+            xml_file.write_declaration()
+            with xml_file.element("oem", id="CCSDS_OEM_VERS", version=self.version):
+                header = Element("header")
+                self.header._to_xml(header)
+                indent(header, level=1)
+                xml_file.write("\n  ", header, "\n  ")
+                with xml_file.element("body"):
+                    for entry in self._segments:
+                        segment = Element("segment")
+                        entry._to_xml(segment)
+                        indent(segment, level=2)
+                        xml_file.write("\n    ", segment)
+                    xml_file.write("\n  ")
+                xml_file.write("\n")
+        stream.write(b"\n")
 
     def _to_xml_oem(self):
         oem = Element("oem", id="CCSDS_OEM_VERS", version=self.version)
@@ -344,12 +373,12 @@ class OrbitEphemerisMessage(object):
     @property
     def states(self):
         """Return a list of states in all segments."""
-        return [state for segment in self for state in segment.states]
+        return list(self.iter_states())
 
     @property
     def covariances(self):
         """Return a list of covariances in all segments."""
-        return [covariance for segment in self for covariance in segment.covariances]
+        return list(self.iter_covariances())
 
     @property
     def segments(self):
@@ -361,3 +390,11 @@ class OrbitEphemerisMessage(object):
             min(segment.useable_start_time for segment in self),
             max(segment.useable_stop_time for segment in self),
         )
+
+    @property
+    def _segment_starts(self):
+        return [segment.useable_start_time for segment in self._segments]
+
+    @property
+    def _segment_stops(self):
+        return [segment.useable_stop_time for segment in self._segments]
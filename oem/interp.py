@@ -1,50 +1,100 @@
 import numpy as np
+from astropy.time import Time
 
 
 def lagrange(x, y):
-    """Create a Lagrange interpolation polynomial.
+    """Create a barycentric Lagrange interpolation function.
 
-    Create a Lagrange interpolation polynomial of order N-1 where N is the
-    number of (x, y) coordinates provided.
+    Create a Lagrange interpolation function of order N-1 where N is the
+    number of (x, y) coordinates provided. The barycentric weights are
+    computed once so that evaluation requires no linear solve.
 
     Args:
         x (ndarray): Interpolation point x values, length N.
-        y (ndarray): Interpolation point y values, length N.
+        y (ndarray): Interpolation point y values, shape (N,) or (N, M).
 
     Returns:
-        poly (poly1d): Polynomial object called with poly(x).
+        poly (callable): Interpolation function called with poly(x). For
+            2-dimensional y, the output has one row per column of y.
     """
-    order = x.size - 1
-    A = np.power(np.tile(x, (order + 1, 1)).T, np.arange(order + 1))
-    a = np.linalg.solve(A, y)
-    return np.poly1d(a[::-1])
+    weights = 1.0 / np.prod(x[:, None] - x[None, :] + np.eye(x.size), axis=1)
+
+    def evaluate(t):
+        diff = np.subtract.outer(np.asarray(t, dtype=float), x)
+        exact = diff == 0
+        diff[exact] = 1.0
+        kernel = weights / diff
+        kernel /= kernel.sum(axis=-1, keepdims=True)
+        at_node = exact.any(axis=-1)
+        if at_node.any():
+            kernel[at_node] = exact[at_node]
+        values = kernel @ y
+        return np.moveaxis(values, -1, 0) if y.ndim > 1 else values
+
+    return evaluate
 
 
 def hermite(x, y, dy):
     """Create a Hermite interpolation polynomial.
 
-    Create a Hermite interpolation polynomial of order N-1 where N is the
-    number of (x, y, dy) entries provided.
+    Create a Hermite interpolation polynomial of order 2N-1 where N is the
+    number of (x, y, dy) entries provided. The polynomial is built in Newton
+    form from a confluent divided-difference table.
 
     Args:
         x (ndarray): Interpolation point x values, length N.
-        y (ndarray): Interpolation point y values, length N.
-        dy (ndarray): Interpolation point dy/dx values, length N.
+        y (ndarray): Interpolation point y values, shape (N,) or (N, M).
+        dy (ndarray): Interpolation point dy/dx values, same shape as y.
+
+    Returns:
+        nodes (ndarray): Newton form nodes, length 2N.
+        coeffs (ndarray): Newton form coefficients. For 2-dimensional y, the
+            output has one row per column of y.
+    """
+    nodes = np.repeat(x, 2)
+    vectorized = np.ndim(y) > 1
+    y = np.asarray(y, dtype=float).reshape(x.size, -1)
+    dy = np.asarray(dy, dtype=float).reshape(x.size, -1)
+
+    coeffs = np.repeat(y, 2, axis=0)
+    coeffs[1::2] = dy
+    coeffs[2::2] = (y[1:] - y[:-1]) / (x[1:] - x[:-1])[:, None]
+    for order in range(2, nodes.size):
+        coeffs[order:] = (coeffs[order:] - coeffs[order - 1 : -1]) / (
+            nodes[order:] - nodes[:-order]
+        )[:, None]
+
+    return nodes, coeffs.T if vectorized else coeffs[:, 0]
+
+
+def newton(nodes, coeffs, t):
+    """Evaluate a stack of Newton form polynomials and their derivatives.
+
+    Args:
+        nodes (ndarray): Newton form nodes.
+        coeffs (ndarray): Newton form coefficients, one polynomial per row.
+        t (float or ndarray): Evaluation point(s).
 
     Returns:
-        poly (poly1d): Polynomial object called with poly(x).
+        values (ndarray): Polynomial values with one row per polynomial.
+        derivatives (ndarray): Polynomial derivatives with one row per
+            polynomial.
     """
-    order = 2 * x.size - 1
-    c = np.tile(x, (order + 1, 1)).T
-    Au = np.power(c, np.arange(order + 1))
-    Al = np.multiply(
-        np.power(c, np.hstack(([1], np.arange(order)))),
-        np.tile(np.hstack(([0, 1], np.arange(2, order + 1))), (x.size, 1)),
-    )
-    A = np.vstack((Au, Al))
-    b = np.hstack((y, dy))
-    a = np.linalg.solve(A, b)
-    return np.poly1d(a[::-1])
+    t = np.asarray(t, dtype=float)
+    columns = coeffs.T.reshape(coeffs.shape[::-1] + (1,) * t.ndim)
+    values = columns[-1] + np.zeros_like(t)
+    derivatives = np.zeros_like(values)
+    for node, column in zip(nodes[-2::-1], columns[-2::-1]):
+        offset = t - node
+        derivatives = derivatives * offset + values
+        values = values * offset + column
+    return values, derivatives
+
+
+def _elapsed_times(epochs, reference):
+    if isinstance(epochs, Time):
+        return np.atleast_1d((epochs - reference).sec)
+    return np.array([(epoch - reference).sec for epoch in epochs])
 
 
 class Interpolator(object):
@@ -53,19 +103,20 @@ class Interpolator(object):
         self._setup(states)
 
     def __call__(self, epoch):
-        t = (epoch - self.reference_epoch).sec
-        raw_state = np.array([poly(t) for poly in self._state_polynomials])
-        position = raw_state[:3]
-        velocity = raw_state[3:6]
+        return self._evaluate((epoch - self.reference_epoch).sec)
+
+    def _evaluate(self, t):
+        raw_state = self._interpolate(t)
+        position = raw_state[:3].T
+        velocity = raw_state[3:6].T
         if len(raw_state) == 9:
-            acceleration = raw_state[6:]
+            acceleration = raw_state[6:].T
         else:
             acceleration = None
         return position, velocity, acceleration
 
     def _elapsed_times(self, states):
-        reference = self.reference_epoch
-        return np.array(tuple((epoch - reference).sec for epoch in states[0]))
+        return _elapsed_times(states[0], self.reference_epoch)
 
     @property
     def reference_epoch(self):
@@ -84,9 +135,10 @@ class LagrangeStateInterpolator(Interpolator):
     def _setup(self, states):
         t = self._elapsed_times(states)
         state_vectors = np.column_stack(states[1:])
-        self._state_polynomials = [
-            lagrange(t, state_vectors[:, idx]) for idx in range(state_vectors.shape[1])
-        ]
+        self._state_polynomial = lagrange(t, state_vectors)
+
+    def _interpolate(self, t):
+        return self._state_polynomial(t)
 
 
 class HermiteStateInterpolator(Interpolator):
@@ -101,24 +153,15 @@ class HermiteStateInterpolator(Interpolator):
     def _setup(self, states):
         t = self._elapsed_times(states)
         state_vectors = np.column_stack(states[1:])
-        self._state_polynomials = [
-            hermite(t, state_vectors[:, idx], state_vectors[:, idx + 3])
-            for idx in range(3)
-        ]
-
+        self._nodes, coeffs = hermite(t, state_vectors[:, :3], state_vectors[:, 3:6])
         if state_vectors.shape[1] == 9:
-            self._state_polynomials += [
-                hermite(t, state_vectors[:, idx + 3], state_vectors[:, idx + 6])
-                for idx in range(3)
-            ]
-            self._state_polynomials += [
-                entry.deriv() for entry in self._state_polynomials[3:]
-            ]
+            _, accel_coeffs = hermite(t, state_vectors[:, 3:6], state_vectors[:, 6:])
+            coeffs = np.vstack((coeffs, accel_coeffs))
+        self._coeffs = coeffs
 
-        else:
-            self._state_polynomials += [
-                entry.deriv() for entry in self._state_polynomials
-            ]
+    def _interpolate(self, t):
+        values, derivatives = newton(self._nodes, self._coeffs, t)
+        return np.concatenate((values, derivatives[-3:]))
 
 
 class EphemerisInterpolator(object):
@@ -126,36 +169,85 @@ class EphemerisInterpolator(object):
         "lagrange": LagrangeStateInterpolator,
         "hermite": HermiteStateInterpolator,
     }
+    cache_size = 64
 
     def __init__(self, states, method, order):
         self.base_interpolator = self.method_map[method.lower()]
         self._states = states
         self._order = order
+        self._interpolators = {}
         self._populate_interpolator_nodes(states[0], order)
 
     def __call__(self, epoch):
+        if isinstance(epoch, Time) and not epoch.isscalar:
+            return self.sample(epoch)
         interpolator = self._get_best_interpolator(epoch)
         return interpolator(epoch)
 
+    def _elapsed_times(self, epochs):
+        return _elapsed_times(epochs, self.reference_epoch)
+
     def _populate_interpolator_nodes(self, epochs, order):
         samples = self.base_interpolator._samples_required(order)
-        elapsed_times = np.array(
-            [(entry - self.reference_epoch).sec for entry in epochs]
-        )
-        self._nodes = np.array(
-            [
-                np.mean(elapsed_times[idx : (idx + samples)])
-                for idx in range(len(elapsed_times) - samples + 1)
-            ]
-        )
+        elapsed_times = self._elapsed_times(epochs)
+        self._state_times = elapsed_times
+        if len(elapsed_times) < samples:
+            raise ValueError("Insufficient states for interpolation order")
+        self._nodes = np.lib.stride_tricks.sliding_window_view(
+            elapsed_times, samples
+        ).mean(axis=1)
+        self._midpoints = 0.5 * (self._nodes[:-1] + self._nodes[1:])
+
+    def _build_interpolator(self, best_idx):
+        interpolator = self._interpolators.get(best_idx)
+        if interpolator is None:
+            if len(self._interpolators) >= self.cache_size:
+                del self._interpolators[next(iter(self._interpolators))]
+            samples = self.base_interpolator._samples_required(self.order)
+            interpolator = self.base_interpolator(
+                tuple(entry[best_idx : best_idx + samples] for entry in self._states)
+            )
+            self._interpolators[best_idx] = interpolator
+        return interpolator
 
     def _get_best_interpolator(self, epoch):
         elapsed_time = (epoch - self.reference_epoch).sec
-        best_idx = np.argmin(np.abs(self._nodes - elapsed_time))
-        samples = self.base_interpolator._samples_required(self.order)
-        return self.base_interpolator(
-            tuple(entry[best_idx : best_idx + samples] for entry in self._states)
-        )
+        best_idx = np.searchsorted(self._midpoints, elapsed_time)
+        return self._build_interpolator(best_idx)
+
+    def sample(self, epochs):
+        """Evaluate the interpolator at a sequence of epochs.
+
+        Epochs sharing an interpolation window are evaluated together, so each
+        window is only constructed once regardless of the number of samples.
+
+        Args:
+            epochs (Time or iterable of Time): Sample epochs.
+
+        Returns:
+            tuple: Arrays of sampled positions, velocities, and accelerations
+                with one row per epoch. Accelerations are None if the
+                underlying states do not include acceleration.
+        """
+        elapsed_times = self._elapsed_times(epochs)
+        best_idx = np.searchsorted(self._midpoints, elapsed_times)
+        order = np.argsort(best_idx, kind="stable")
+        groups, splits = np.unique(best_idx[order], return_index=True)
+
+        count = len(elapsed_times)
+        positions = np.empty((count, 3))
+        velocities = np.empty((count, 3))
+        accelerations = np.empty((count, 3)) if len(self._states) == 10 else None
+        for idx, members in zip(groups, np.split(order, splits[1:])):
+            interpolator = self._build_interpolator(idx)
+            position, velocity, acceleration = interpolator._evaluate(
+                elapsed_times[members] - self._state_times[idx]
+            )
+            positions[members] = position
+            velocities[members] = velocity
+            if accelerations is not None:
+                accelerations[members] = acceleration
+        return positions, velocities, accelerations
 
     @property
     def reference_epoch(self):
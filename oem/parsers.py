@@ -1,15 +1,17 @@
 import re
 from enum import Enum
 
-from defusedxml.ElementTree import parse
+from lxml.etree import XMLPullParser
 
 Section = Enum("Section", ["HEADER", "META", "DATA", "COVARIANCE"])
 
 
-HS = r"(?:[ \t]|$)+"
-"""Arbitrary Horizontal spacing or EOL"""
+HS = r"[ \t]+"
+"""Arbitrary horizontal spacing"""
 KEY_VAL = f"([A-Z_]+){HS}={HS}(.+)"
 """Key-value pair"""
+KEY_VAL_RE = re.compile(KEY_VAL)
+"""Compiled key-value pair pattern"""
 
 COV_XML_KEYS = (
     "CX_X",
@@ -36,6 +38,16 @@ COV_XML_KEYS = (
 )
 
 
+XML_PARSER_OPTIONS = {
+    "resolve_entities": False,
+    "no_network": True,
+    "collect_ids": False,
+    "remove_comments": True,
+    "remove_pis": True,
+}
+"""XML parser options with entity resolution and network access disabled"""
+
+
 def err(line_number, message):
     raise ValueError(f"Error on line {line_number + 2}: {message}")
 
@@ -44,9 +56,9 @@ def parse_kvn_oem(ephem_file):
     section = Section.HEADER
     header, segments = {}, []
     covdata = None
-    data_length = None
+    data_length, data_rows = None, None
 
-    match = re.match(KEY_VAL, ephem_file.readline())
+    match = KEY_VAL_RE.match(ephem_file.readline())
     if match:
         header[match.group(1)] = match.group(2)
     if "CCSDS_OEM_VERS" not in header:
@@ -66,18 +78,18 @@ def parse_kvn_oem(ephem_file):
                 section = Section.COVARIANCE
                 continue
 
-            date, *values = line.split()
+            row = line.split()
             if data_length is None:
-                data_length = len(values)
+                data_length = len(row) - 1
                 if data_length not in (6, 9):
                     err(idx, "Malformed data entry")
-            elif len(values) != data_length:
+            elif len(row) - 1 != data_length:
                 err(idx, "Data contains mix of data lengths.")
             try:
-                values = tuple(float(entry) for entry in values)
+                row[1:] = map(float, row[1:])
             except Exception:
                 err(idx, "Malformed data entry")
-            segments[-1]["data"].append((date, *values))
+            data_rows.append(row)
 
         elif section == Section.COVARIANCE:
             if line == "COVARIANCE_STOP":
@@ -91,20 +103,21 @@ def parse_kvn_oem(ephem_file):
             if not covdata:
                 covdata = {
                     "frame": segments[-1]["header"]["REF_FRAME"],
-                    "data": (),
+                    "data": [],
                 }
                 in_header = True
 
             if "=" in line:
                 if not in_header:
                     err(idx, "Malformed covariance")
-                match = re.match(KEY_VAL, line)
+                match = KEY_VAL_RE.match(line)
                 if match:
                     # TODO: Prevent repeats
-                    if match.group(1) == "EPOCH":
-                        covdata["epoch"] = match.group(2)
-                    elif match.group(1) == "COV_REF_FRAME":
-                        covdata["frame"] = match.group(2)
+                    key, value = match.groups()
+                    if key == "EPOCH":
+                        covdata["epoch"] = value
+                    elif key == "COV_REF_FRAME":
+                        covdata["frame"] = value
                     else:
                         err(idx, "Invalid covariance header")
                 else:
@@ -113,16 +126,14 @@ def parse_kvn_oem(ephem_file):
                 if in_header:
                     in_header = False
                     cov_data_line = 1
-                    covdata["data"] = covdata["data"] + (float(line),)
+                    covdata["data"].append(float(line))
                 else:
                     cov_data_line += 1
                     raw_values = line.split()
                     if len(raw_values) != cov_data_line:
                         err(idx, "Malformed covariance shape")
                     try:
-                        covdata["data"] = covdata["data"] + tuple(
-                            float(entry) for entry in raw_values
-                        )
+                        covdata["data"].extend(map(float, raw_values))
                     except ValueError:
                         err(idx, "Malformed covariance data")
 
@@ -142,11 +153,12 @@ def parse_kvn_oem(ephem_file):
                 segments.append({"header": {}, "data": [], "cov": []})
                 continue
 
-            match = re.match(KEY_VAL, line)
+            match = KEY_VAL_RE.match(line)
             if match:
-                if match.group(1) in header:
-                    err(idx, f"Duplicate header: {match.group(1)}")
-                header[match.group(1)] = match.group(2)
+                key, value = match.groups()
+                if key in header:
+                    err(idx, f"Duplicate header: {key}")
+                header[key] = value
             else:
                 err(idx, "Invalid header entry")
 
@@ -154,67 +166,96 @@ def parse_kvn_oem(ephem_file):
             if line == "META_STOP":
                 section = Section.DATA
                 data_length = None
+                data_rows = segments[-1]["data"]
                 continue
 
-            match = re.match(KEY_VAL, line)
+            match = KEY_VAL_RE.match(line)
             if match:
-                if match.group(1) in segments[-1]["header"]:
-                    err(idx, f"Duplicate entry: {match.group(1)}")
-                segments[-1]["header"][match.group(1)] = match.group(2)
+                key, value = match.groups()
+                metadata = segments[-1]["header"]
+                if key in metadata:
+                    err(idx, f"Duplicate entry: {key}")
+                metadata[key] = value
             else:
                 err(idx, "Invalid meta entry")
 
     return header, segments
 
 
-def parse_xml_oem(ephem_file):
-    parts = parse(ephem_file).getroot()
-
-    header = {
-        entry.tag.rpartition("}")[-1]: entry.text
-        for entry in parts[0]
-        if entry.tag.rpartition("}")[-1] != "COMMENT"
-    }
-    header["CCSDS_OEM_VERS"] = parts.attrib["version"]
-
-    segments = []
-    for raw_segment in parts[1]:
-        raw_metadata, raw_data = raw_segment
-
-        segment = {}
-        segment["header"] = {
-            entry.tag.rpartition("}")[-1]: entry.text
-            for entry in raw_metadata
-            if entry.tag.rpartition("}")[-1] != "COMMENT"
-        }
-
-        keys = ("X", "Y", "Z", "X_DOT", "Y_DOT", "Z_DOT")
-        try:
-            if raw_data.find("stateVector").find("X_DDOT") is not None:
-                keys = keys + ("X_DDOT", "Y_DDOT", "Z_DDOT")
-            segment["data"] = tuple(
-                (entry.find("EPOCH").text,)
-                + tuple(float(entry.find(key).text) for key in keys)
-                for entry in raw_data
-                if entry.tag.rpartition("}")[-1] == "stateVector"
-            )
-        except Exception:
-            raise ValueError("Malformed data section")
-
-        ref_frame = raw_metadata.find("REF_FRAME")
-        try:
-            segment["cov"] = tuple(
-                (
-                    entry.find("EPOCH").text,
-                    (entry.find("COV_REF_FRAME") or ref_frame).text,
-                    *(float(entry.find(key).text) for key in COV_XML_KEYS),
+def _iter_xml_events(ephem_file, chunk_size=65536):
+    parser = XMLPullParser(events=("start", "end"), **XML_PARSER_OPTIONS)
+    while True:
+        chunk = ephem_file.read(chunk_size)
+        if not chunk:
+            break
+        parser.feed(chunk)
+        yield from parser.read_events()
+    parser.close()
+    yield from parser.read_events()
+
+
+def _xml_fields(element, namespace):
+    skip = len(namespace)
+    comment = namespace + "COMMENT"
+    return {entry.tag[skip:]: entry.text for entry in element if entry.tag != comment}
+
+
+def _parse_xml_segment(raw_segment, namespace=""):
+    raw_metadata, raw_data = raw_segment
+
+    segment = {}
+    segment["header"] = _xml_fields(raw_metadata, namespace)
+
+    keys = ("X", "Y", "Z", "X_DOT", "Y_DOT", "Z_DOT")
+    accel_keys = ("X_DDOT", "Y_DDOT", "Z_DDOT")
+    ref_frame = segment["header"].get("REF_FRAME")
+    state_tag = namespace + "stateVector"
+    covariance_tag = namespace + "covarianceMatrix"
+    states, covariances = [], []
+    for entry in raw_data:
+        if entry.tag == state_tag:
+            try:
+                fields = _xml_fields(entry, namespace)
+                if not states and "X_DDOT" in fields:
+                    keys = keys + accel_keys
+                states.append((fields["EPOCH"], *(float(fields[key]) for key in keys)))
+            except Exception:
+                raise ValueError("Malformed data section")
+        elif entry.tag == covariance_tag:
+            try:
+                fields = _xml_fields(entry, namespace)
+                covariances.append(
+                    (
+                        fields["EPOCH"],
+                        fields.get("COV_REF_FRAME", ref_frame),
+                        *(float(fields[key]) for key in COV_XML_KEYS),
+                    )
                 )
-                for entry in raw_data
-                if entry.tag.rpartition("}")[-1] == "covarianceMatrix"
-            )
-        except Exception:
-            raise ValueError("Malformed covariance section")
+            except Exception:
+                raise ValueError("Malformed covariance section")
+    segment["data"] = tuple(states)
+    segment["cov"] = tuple(covariances)
+
+    return segment
 
-        segments.append(segment)
+
+def parse_xml_oem(ephem_file):
+    events = _iter_xml_events(ephem_file)
+    _, root = next(events)
+    namespace = root.tag[: root.tag.find("}") + 1]
+    header_tag, segment_tag = namespace + "header", namespace + "segment"
+
+    header, segments = {}, []
+    for event, element in events:
+        if event != "end":
+            continue
+        if element.tag == header_tag:
+            header = _xml_fields(element, namespace)
+        elif element.tag == segment_tag:
+            segments.append(_parse_xml_segment(element, namespace))
+            element.clear()
+            while element.getprevious() is not None:
+                del element.getparent()[0]
+    header["CCSDS_OEM_VERS"] = root.attrib["version"]
 
     return header, segments
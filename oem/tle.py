@@ -1,4 +1,3 @@
-import numpy as np
 from astropy import units as u
 from astropy.coordinates import (
     GCRS,
@@ -39,11 +38,11 @@ def _build_metadata(satrec, start_epoch, stop_epoch):
 
 
 def _build_segment(satrec, start_epoch, stop_epoch, step, frame):
-    epoch_range = list(time_range(start_epoch, stop_epoch, step))
+    epoch_range = time_range(start_epoch, stop_epoch, step)
     position, velocity = _sample_tle_at_epoch_array(satrec, epoch_range, frame)
     return EphemerisSegment(
         _build_metadata(satrec, start_epoch, stop_epoch),
-        (epoch_range, *zip(*position), *zip(*velocity)),
+        (epoch_range, *position.T, *velocity.T),
     )
 
 
@@ -56,17 +55,16 @@ def _build_oem(satrec, start_epoch, stop_epoch, step, frame):
 def _sample_tle_at_epoch_array(satrec, epochs, frame):
     if frame not in ("TEME", "ICRF"):
         raise ValueError(f"Unsupported frame: {frame}")
-    jd1 = np.array([epoch.jd1 for epoch in epochs])
-    jd2 = np.array([epoch.jd2 for epoch in epochs])
-    err, r, v = satrec.sgp4_array(jd1, jd2)
+    err, r, v = satrec.sgp4_array(epochs.jd1, epochs.jd2)
     if any(err):
         raise ValueError("SGP4 propagation failed!")
+    elif frame == "TEME":
+        return r, v
     else:
         teme_p = CartesianRepresentation(r.T * u.km)
         teme_v = CartesianDifferential(v.T * u.km / u.s)
         states = TEME(teme_p.with_differentials(teme_v), obstime=epochs)
-        if frame == "ICRF":
-            states = states.transform_to(GCRS(obstime=epochs))
+        states = states.transform_to(GCRS(obstime=epochs))
         return (
             states.cartesian.get_xyz().value.T,
             states.cartesian.differentials["s"].get_d_xyz().value.T,
@@ -1,8 +1,12 @@
 import bz2
 import datetime as dt
 import gzip
+import io
 import lzma
+import os
 import warnings
+from contextlib import contextmanager
+from functools import lru_cache
 
 import numpy as np
 from astropy.time import Time, TimeDelta
@@ -21,25 +25,36 @@ def parse_str(input_string, metadata):
     return str(input_string)
 
 
+@lru_cache(maxsize=4096)
 def parse_datetime(epoch):
     """Convert OEM standard epoch to a DateTime.
 
+    Results are cached, since the same metadata epochs are parsed each time
+    they are accessed.
+
     Args:
         epoch (str): OEM epoch string.
 
     Returns:
         parsed_epoch (DateTime):  Parsed epoch.
     """
-    ymd_fmt = "%Y-%m-%d" if epoch.count("-") == 2 else "%Y-%j"
-    if "." in epoch:
-        return dt.datetime.strptime(
-            epoch.replace("Z", "")[: epoch.index(".") + 7].strip(),
-            f"{ymd_fmt}T%H:%M:%S.%f",
-        )
+    text = epoch.strip().rstrip("Z")
+    date_time, separator, fraction = text.partition(".")
+    if separator and not fraction.isdigit():
+        raise ValueError(f"Invalid epoch fraction: {epoch}")
+    if len(date_time) == 19 and date_time[10] == "T" and date_time.count("-") == 2:
+        try:
+            return dt.datetime.fromisoformat(f"{date_time}.{fraction[:6]:0<6}")
+        except ValueError:
+            pass
+
+    if date_time.count("-") == 2:
+        epoch_fmt = "%Y-%m-%dT%H:%M:%S"
     else:
-        return dt.datetime.strptime(
-            epoch.replace("Z", "").strip(), f"{ymd_fmt}T%H:%M:%S"
-        )
+        epoch_fmt = "%Y-%jT%H:%M:%S"
+    if fraction:
+        return dt.datetime.strptime(f"{date_time}.{fraction[:6]}", f"{epoch_fmt}.%f")
+    return dt.datetime.strptime(date_time, epoch_fmt)
 
 
 def parse_utc(epoch, metadata):
@@ -54,6 +69,21 @@ def parse_utc(epoch, metadata):
     return Time(parse_datetime(epoch), format="datetime", scale="utc", precision=6)
 
 
+@lru_cache(maxsize=16)
+def _time_scale(time_system):
+    """Resolve an OEM TIME_SYSTEM to an astropy time scale.
+
+    Args:
+        time_system (str): OEM TIME_SYSTEM value.
+
+    Returns:
+        scale (str or None): Matching astropy scale, or None if the time
+            system is not supported by astropy.
+    """
+    scale = time_system.lower()
+    return scale if scale in Time.SCALES else None
+
+
 def parse_epoch(epoch, metadata):
     """Parse OEM standard epoch using metadata TIME_SYSTEM.
 
@@ -67,13 +97,14 @@ def parse_epoch(epoch, metadata):
             then parsed_epoch will warn the user and fall back to DateTime. In
             this case, time calculations may be inaccurate.
     """
-    time_system = metadata["TIME_SYSTEM"].lower()
+    time_system = metadata["TIME_SYSTEM"]
+    scale = _time_scale(time_system)
     dt_epoch = parse_datetime(epoch)
-    if time_system in Time.SCALES:
-        parsed_epoch = Time(dt_epoch, format="datetime", scale=time_system, precision=6)
+    if scale is not None:
+        parsed_epoch = Time(dt_epoch, format="datetime", scale=scale, precision=6)
     else:
         warnings.warn(
-            f"Unsupported TIME_SYSTEM '{time_system}', falling back to "
+            f"Unsupported TIME_SYSTEM '{time_system.lower()}', falling back to "
             f"DateTime. Use caution with time calculations."
         )
         parsed_epoch = dt_epoch
@@ -105,16 +136,17 @@ def _bulk_parse_epochs(epochs, metadata):
     Returns:
         parsed_epochs (list of Time):
     """
-    time_system = metadata["TIME_SYSTEM"].lower()
+    time_system = metadata["TIME_SYSTEM"]
+    scale = _time_scale(time_system)
     fmt = _identify_epoch_format(epochs[0])
     if fmt != "isot":
         epochs = tuple(_coerce_epoch_yday(epoch) for epoch in epochs)
 
-    if time_system in Time.SCALES:
-        parsed_epochs = Time(epochs, format=fmt, scale=time_system, precision=6)
+    if scale is not None:
+        parsed_epochs = Time(epochs, format=fmt, scale=scale, precision=6)
     else:
         warnings.warn(
-            f"Unsupported TIME_SYSTEM '{time_system}', falling back to "
+            f"Unsupported TIME_SYSTEM '{time_system.lower()}', falling back to "
             f"DateTime. Use caution with time calculations."
         )
         parsed_epochs = tuple(parse_epoch(epoch, metadata) for epoch in epochs)
@@ -122,6 +154,38 @@ def _bulk_parse_epochs(epochs, metadata):
     return parsed_epochs
 
 
+def _stack_epochs(epochs):
+    """Combine scalar epochs into a single array for vectorized comparisons.
+
+    Args:
+        epochs (iterable of Time or DateTime): Scalar epochs sharing a common
+            time scale.
+
+    Returns:
+        stacked_epochs (Time or ndarray): Array-valued Time if all inputs are
+            Time objects, otherwise an object array of the inputs.
+    """
+    epochs = list(epochs)
+    if all(isinstance(epoch, Time) for epoch in epochs):
+        stacked_epochs = Time(epochs)
+    else:
+        stacked_epochs = np.array(epochs, dtype=object)
+    return stacked_epochs
+
+
+def _epochs_equal(epochs1, epochs2):
+    """Compare two sequences of epochs element-wise.
+
+    Args:
+        epochs1 (Time or tuple): Array-valued Time or sequence of epochs.
+        epochs2 (Time or tuple): Array-valued Time or sequence of epochs.
+
+    Returns:
+        equal (bool): True if both inputs contain identical epochs.
+    """
+    return len(epochs1) == len(epochs2) and bool(np.all(epochs1 == epochs2))
+
+
 def parse_integer(input, metadata):
     """Parse integer value.
 
@@ -134,8 +198,14 @@ def parse_integer(input, metadata):
     Raises:
         ValueError: Invalid integer.
     """
-    if float(input).is_integer():
-        return int(input)
+    if isinstance(input, str):
+        try:
+            return int(input)
+        except ValueError:
+            pass
+    value = float(input)
+    if value.is_integer():
+        return int(value)
     else:
         raise ValueError(f"Invalid integer: '{input}'")
 
@@ -161,7 +231,28 @@ def format_epoch(epoch):
     Returns:
         formatted_epoch (str): Epoch in YYYY-MM-DDTHH:MM:SS.ssssss format.
     """
-    return epoch.strftime("%Y-%m-%dT%H:%M:%S.%f")
+    if isinstance(epoch, Time):
+        return epoch.isot
+    return (
+        f"{epoch.year:04d}-{epoch.month:02d}-{epoch.day:02d}T"
+        f"{epoch.hour:02d}:{epoch.minute:02d}:{epoch.second:02d}."
+        f"{epoch.microsecond:06d}"
+    )
+
+
+def _format_epochs(epochs):
+    """Format a sequence of epochs in the standard OEM format.
+
+    Args:
+        epochs (Time or tuple): Array-valued Time or sequence of epochs.
+
+    Returns:
+        formatted_epochs (iterable of str): Formatted epochs. Array-valued
+            Time inputs are converted in a single call.
+    """
+    if isinstance(epochs, Time):
+        return epochs.isot
+    return map(format_epoch, epochs)
 
 
 def require(boolean, message):
@@ -200,11 +291,14 @@ def is_kvn(file_path):
     returns:
         result (bool): True if file is KVN, false if XML.
     """
-    with _open(file_path, "rt") as target_file:
-        if "<?xml" in target_file.readline():
-            result = False
-        else:
-            result = True
+    with _open(file_path, "rb") as target_file:
+        result = b"<?xml" not in target_file.readline()
+    return result
+
+
+def _is_kvn_stream(stream):
+    result = "<?xml" not in stream.readline()
+    stream.seek(0)
     return result
 
 
@@ -217,11 +311,10 @@ def time_range(start_time, stop_time, step_sec):
         step_sec (float): Step size in seconds.
 
     Returns:
-        times (generator): Generator of sample astropy Times.
+        times (Time): Array-valued astropy Time of sample epochs.
     """
     delta = (stop_time - start_time).sec
-    for elapsed in np.arange(0, delta, step_sec):
-        yield start_time + TimeDelta(elapsed, format="sec")
+    return start_time + TimeDelta(np.arange(0, delta, step_sec), format="sec")
 
 
 def epoch_span_contains(span, epoch):
@@ -258,25 +351,38 @@ def epoch_span_overlap(span1, span2):
     return overlap_range
 
 
-def _get_compression(path):
+_OPENERS = {"gzip": gzip.open, "bz2": bz2.open, "lzma": lzma.open, None: open}
+
+
+def _get_compression(header):
     headers = {
         b"\x1F\x8b": "gzip",
         b"\x42\x5A\x68": "bz2",
         b"\x5d\x00\x00": "lzma",
         b"\xFD\x37\x7A\x58\x5A\x00": "lzma",
     }
-    compression = None
-    with open(path, "rb") as fid:
-        header = fid.read(6)
-        for key, value in headers.items():
-            if header.startswith(key):
-                compression = value
-                break
-    return compression
+    for key, value in headers.items():
+        if header.startswith(key):
+            return value
+    return None
+
+
+@contextmanager
+def _open_read(path, mode):
+    with open(path, "rb") as raw_file:
+        compression = _get_compression(raw_file.peek(6)[:6])
+        if compression is not None:
+            stream = _OPENERS[compression](raw_file, mode)
+        elif mode == "rt":
+            stream = io.TextIOWrapper(raw_file)
+        else:
+            stream = raw_file
+        with stream:
+            yield stream
 
 
 def _open(path, mode, compression=None):
-    if mode == "rt":
-        compression = _get_compression(path)
-    openers = {"gzip": gzip.open, "bz2": bz2.open, "lzma": lzma.open, None: open}
-    return openers[compression](path, mode)
+    path = os.fspath(path)
+    if mode in ("rt", "rb"):
+        return _open_read(path, mode)
+    return _OPENERS[compression](path, mode)
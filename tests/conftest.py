@@ -0,0 +1,60 @@
+import io
+
+import pytest
+
+from oem import OrbitEphemerisMessage
+from oem.parsers import parse_kvn_oem, parse_xml_oem
+
+SAMPLE_PARAMS = ("file_path", "filename")
+
+
+def pytest_collection_modifyitems(items):
+    """Group tests of the same sample file onto one pytest-xdist worker.
+
+    Combined with `--dist loadgroup`, this lets each worker reuse the parsed
+    messages held by `oem_loader` instead of parsing every file on every
+    worker.
+    """
+    for item in items:
+        params = getattr(item, "callspec", None)
+        if params is None:
+            continue
+        for name in SAMPLE_PARAMS:
+            if name in params.params:
+                group = str(params.params[name])
+                item.add_marker(pytest.mark.xdist_group(name=group))
+                break
+
+
+@pytest.fixture(scope="session")
+def oem_loader():
+    """Open sample OEMs, parsing each file at most once per session.
+
+    The returned messages are shared between tests and must not be modified;
+    use `.copy()` first if a test needs to mutate one.
+    """
+    cache = {}
+
+    def _load(file_path):
+        key = str(file_path)
+        if key not in cache:
+            cache[key] = OrbitEphemerisMessage.open(file_path)
+        return cache[key]
+
+    return _load
+
+
+@pytest.fixture(scope="session")
+def round_trip():
+    """Serialize an OEM and parse it back in memory, without touching disk."""
+
+    def _round_trip(oem, file_format):
+        if file_format == "kvn":
+            data = parse_kvn_oem(io.StringIO(oem._to_kvn_oem()))
+        else:
+            buffer = io.BytesIO()
+            oem._write_xml(buffer)
+            data = parse_xml_oem(io.StringIO(buffer.getvalue().decode("utf-8")))
+        return OrbitEphemerisMessage._from_raw_data(data)
+
+    return _round_trip
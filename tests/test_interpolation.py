@@ -1,4 +1,4 @@
-import datetime as dt
+from functools import lru_cache
 from pathlib import Path
 
 import numpy as np
@@ -14,6 +14,7 @@ from oem.interp import (
 
 THIS_DIR = Path(__file__).parent
 SAMPLE_DIR = THIS_DIR / "samples"
+BASE_EPOCH = Time("2020-01-01T00:00:00", format="isot", scale="utc")
 
 
 def _make_test_states(poly, t_step, count, accel=True):
@@ -28,22 +29,35 @@ def _make_test_states(poly, t_step, count, accel=True):
     Returns:
         states (list): List of State with position, velocity, and acceleration
             following poly, poly.deriv, and poly.deriv.deriv, respectively.
-            Epochs are DateTimes starting at the current time and stepping
-            by t_step.
+            Epochs are an array-valued Time starting at BASE_EPOCH and
+            stepping by t_step.
     """
-    start_epoch = dt.datetime.now()
-    epochs = [
-        Time(start_epoch + dt.timedelta(seconds=t_step * idx)) for idx in range(count)
-    ]
-    positions = [poly([t_step * idx] * 3) for idx in range(count)]
-    velocities = [poly.deriv()([t_step * idx] * 3) for idx in range(count)]
+    epochs = BASE_EPOCH + TimeDelta(np.arange(count) * t_step, format="sec")
+    elapsed = np.arange(count) * t_step
+    dpoly = poly.deriv()
+    position, velocity = poly(elapsed), dpoly(elapsed)
     if accel:
-        accelerations = [
-            poly.deriv().deriv()([t_step * idx] * 3) for idx in range(count)
-        ]
-        return (epochs, *zip(*positions), *zip(*velocities), *zip(*accelerations))
+        acceleration = dpoly.deriv()(elapsed)
+        return (epochs, *[position] * 3, *[velocity] * 3, *[acceleration] * 3)
     else:
-        return (epochs, *zip(*positions), *zip(*velocities))
+        return (epochs, *[position] * 3, *[velocity] * 3)
+
+
+@lru_cache(maxsize=None)
+def _cached_test_states(coeffs, t_step, count, accel=True):
+    """Create state samples for testing, reusing results across test cases.
+
+    Args:
+        coeffs (tuple): Coefficients of the polynomial describing position
+            history.
+        t_step (float): State time step in seconds.
+        count (int): Number of points to sample.
+        accel (bool, optional): If True, output States will have accelerations.
+
+    Returns:
+        states (tuple): Output of _make_test_states for these inputs.
+    """
+    return _make_test_states(np.poly1d(coeffs), t_step, count, accel=accel)
 
 
 @pytest.mark.parametrize("has_accel", (True, False))
@@ -57,16 +71,18 @@ def test_interpolators(Interpolator, samples, has_accel):
     acceleration = velocity.deriv()
     time_step = 60
 
-    states = _make_test_states(position, time_step, samples, accel=has_accel)
+    states = _cached_test_states(
+        tuple(position.coeffs), time_step, samples, accel=has_accel
+    )
     interpolator = Interpolator(states)
 
-    for elapsed in np.arange(0, (samples - 1) * time_step, 1):
-        test_epoch = states[0][0] + TimeDelta(elapsed, format="sec")
-        predict_pos, predict_vel, predict_accel = interpolator(test_epoch)
-        np.testing.assert_almost_equal(predict_pos, position(elapsed))
-        np.testing.assert_almost_equal(predict_vel, velocity(elapsed))
-        if has_accel:
-            np.testing.assert_almost_equal(predict_accel, acceleration(elapsed))
+    elapsed = np.arange(0, (samples - 1) * time_step, 1)
+    test_epochs = states[0][0] + TimeDelta(elapsed, format="sec")
+    predict_pos, predict_vel, predict_accel = interpolator(test_epochs)
+    np.testing.assert_almost_equal(predict_pos.T, [position(elapsed)] * 3)
+    np.testing.assert_almost_equal(predict_vel.T, [velocity(elapsed)] * 3)
+    if has_accel:
+        np.testing.assert_almost_equal(predict_accel.T, [acceleration(elapsed)] * 3)
 
 
 @pytest.mark.parametrize("has_accel", (True, False))
@@ -78,16 +94,18 @@ def test_ephemeris_interpolator(method, order, has_accel):
     time_step = 30
     samples = 25
 
-    states = _make_test_states(position, time_step, samples, accel=has_accel)
+    states = _cached_test_states(
+        tuple(position.coeffs), time_step, samples, accel=has_accel
+    )
     interpolator = EphemerisInterpolator(states, method, order)
 
-    for elapsed in np.arange(0, (samples - 1) * time_step, 5):
-        test_epoch = states[0][0] + TimeDelta(elapsed, format="sec")
-        predict_pos, predict_vel, predict_accel = interpolator(test_epoch)
-        np.testing.assert_almost_equal(predict_pos, position(elapsed), 6)
-        np.testing.assert_almost_equal(predict_vel, velocity(elapsed), 6)
-        if has_accel:
-            np.testing.assert_almost_equal(predict_accel, acceleration(elapsed), 6)
+    elapsed = np.arange(0, (samples - 1) * time_step, 5)
+    test_epochs = states[0][0] + TimeDelta(elapsed, format="sec")
+    predict_pos, predict_vel, predict_accel = interpolator(test_epochs)
+    np.testing.assert_almost_equal(predict_pos.T, [position(elapsed)] * 3, 6)
+    np.testing.assert_almost_equal(predict_vel.T, [velocity(elapsed)] * 3, 6)
+    if has_accel:
+        np.testing.assert_almost_equal(predict_accel.T, [acceleration(elapsed)] * 3, 6)
 
 
 @pytest.mark.parametrize(
@@ -98,18 +116,27 @@ def test_ephemeris_interpolator(method, order, has_accel):
         ("LEO_60s.oem", "LEO_10s.oem"),
     ),
 )
-def test_ephemeris_accuracy(coarse_file, fine_file):
-    fine_sample = SAMPLE_DIR / "real" / fine_file
-    coarse_sample = SAMPLE_DIR / "real" / coarse_file
-    fine_oem = OrbitEphemerisMessage.open(fine_sample)
-    coarse_oem = OrbitEphemerisMessage.open(coarse_sample)
-
-    for state in fine_oem.states:
-        predict = coarse_oem(state.epoch)
-        np.testing.assert_almost_equal(predict.position, state.position, 6)
-        np.testing.assert_almost_equal(predict.velocity, state.velocity, 6)
-        if state.has_accel:
-            np.testing.assert_almost_equal(predict.acceleration, state.acceleration, 6)
+def test_ephemeris_accuracy(coarse_file, fine_file, oem_loader):
+    fine_oem = oem_loader(SAMPLE_DIR / "real" / fine_file)
+    coarse_oem = oem_loader(SAMPLE_DIR / "real" / coarse_file).copy()
+
+    for fine_segment, coarse_segment in zip(fine_oem, coarse_oem):
+        states = list(fine_segment.states)
+        epochs = Time([state.epoch for state in states])
+        positions, velocities, accelerations = coarse_segment._sample(epochs)
+        np.testing.assert_allclose(
+            positions, [state.position for state in states], rtol=0, atol=1e-6
+        )
+        np.testing.assert_allclose(
+            velocities, [state.velocity for state in states], rtol=0, atol=1e-6
+        )
+        if fine_segment.has_accel:
+            np.testing.assert_allclose(
+                accelerations,
+                [state.acceleration for state in states],
+                rtol=0,
+                atol=1e-6,
+            )
 
 
 @pytest.mark.parametrize("input_file", ("GEO_20s.oem", "MEO_20s.oem", "LEO_10s.oem"))
@@ -143,3 +170,30 @@ def test_ephemeris_resample(input_file):
         assert np.isclose(
             (new_oem.states[idx].epoch - new_oem.states[idx - 1].epoch).sec, step_size
         )
+
+
+@pytest.mark.parametrize("input_file", ("GEO_20s.oem", "MEO_20s.oem", "LEO_10s.oem"))
+def test_ephemeris_steps_match_sampling(input_file):
+    sample_file = SAMPLE_DIR / "real" / input_file
+    oem = OrbitEphemerisMessage.open(sample_file)
+
+    for segment in oem:
+        for state in segment.steps(37):
+            predict = segment(state.epoch)
+            np.testing.assert_almost_equal(predict.position, state.position, 6)
+            np.testing.assert_almost_equal(predict.velocity, state.velocity, 6)
+
+
+@pytest.mark.parametrize("input_file", ("GEO_20s.oem", "MEO_20s.oem", "LEO_10s.oem"))
+def test_ephemeris_array_sampling(input_file):
+    sample_file = SAMPLE_DIR / "real" / input_file
+    oem = OrbitEphemerisMessage.open(sample_file)
+
+    for segment in oem:
+        segment._init_interpolator()
+        epochs = Time([state.epoch for state in segment.steps(601)])
+        positions, velocities, _ = segment._interpolator(epochs)
+        for idx, epoch in enumerate(epochs):
+            position, velocity, _ = segment._interpolator(epoch)
+            np.testing.assert_almost_equal(positions[idx], position, 6)
+            np.testing.assert_almost_equal(velocities[idx], velocity, 6)
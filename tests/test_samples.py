@@ -1,26 +1,32 @@
 """Test parsing sample OEMS.
 """
 import glob
-import tempfile
+import weakref
+from functools import lru_cache
 from pathlib import Path
 
 import pytest
+from astropy.time import TimeDelta
 
 from oem import OrbitEphemerisMessage
+from oem.parsers import parse_xml_oem
 from oem.tools import is_kvn
 
 SAMPLE_DIR = Path(__file__).parent / "samples"
 
 
+@lru_cache(maxsize=None)
 def _get_test_files(version="*", validity="*"):
     samples = SAMPLE_DIR / version / validity / "*.oem*"
-    return sorted([entry for entry in glob.glob(str(samples))])
+    return tuple(sorted(glob.glob(str(samples))))
 
 
 @pytest.mark.parametrize("file_path", _get_test_files(validity="valid"))
-def test_valid_samples(file_path):
-    oem = OrbitEphemerisMessage.open(file_path)
+def test_valid_samples(file_path, oem_loader):
+    oem = oem_loader(file_path)
     assert oem.span[0] <= oem.span[1]
+    assert len(oem.states) > 0
+    assert len(oem.covariances) >= 0
 
     for segment in oem:
         if not segment.has_accel:
@@ -31,15 +37,17 @@ def test_valid_samples(file_path):
 
         assert segment.useable_start_time in segment
         assert segment.useable_stop_time in segment
-        assert len(oem.states) > 0
-        assert len(oem.covariances) >= 0
 
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        written_oem_path = Path(tmp_dir) / "written.oem"
-        fmt = "xml" if is_kvn(file_path) else "kvn"
-        OrbitEphemerisMessage.convert(file_path, written_oem_path, fmt)
-        written_oem = OrbitEphemerisMessage.open(written_oem_path)
-        assert written_oem == oem
+
+@pytest.mark.slow
+@pytest.mark.parametrize("file_path", _get_test_files(validity="valid"))
+def test_valid_samples_round_trip(file_path, oem_loader, tmp_path):
+    oem = oem_loader(file_path)
+    written_oem_path = tmp_path / "written.oem"
+    fmt = "xml" if is_kvn(file_path) else "kvn"
+    OrbitEphemerisMessage.convert(file_path, written_oem_path, fmt)
+    written_oem = OrbitEphemerisMessage.open(written_oem_path)
+    assert written_oem == oem
 
 
 @pytest.mark.parametrize("file_path", _get_test_files(validity="invalid"))
@@ -48,18 +56,40 @@ def test_invalid_samples(file_path):
         OrbitEphemerisMessage.open(file_path)
 
 
-@pytest.mark.parametrize("file_path", _get_test_files(validity="valid"))
-def test_convert(file_path):
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        converted_xml_path = Path(tmp_dir) / "written.oem"
-        OrbitEphemerisMessage.convert(file_path, converted_xml_path, "kvn")
-        converted_xml = OrbitEphemerisMessage.open(converted_xml_path)
+@pytest.mark.parametrize(
+    "anchor, duplicate",
+    (
+        ("ORIGINATOR = NASA/JPL\n", "ORIGINATOR = A\n"),
+        ("INTERPOLATION_DEGREE = 7\n", "INTERPOLATION_DEGREE = 7\n"),
+    ),
+)
+def test_duplicate_kvn_keys(anchor, duplicate, tmp_path):
+    sample = SAMPLE_DIR / "v1_0" / "valid" / "sample01.oem"
+    contents = sample.read_text()
+    assert anchor in contents
+    contents = contents.replace(anchor, duplicate + duplicate, 1)
+    file_path = tmp_path / "duplicate.oem"
+    file_path.write_text(contents)
+    with pytest.raises(ValueError, match="Duplicate"):
+        OrbitEphemerisMessage.open(file_path)
+
+
+def test_covariance_header_spacing(tmp_path):
+    sample = SAMPLE_DIR / "v2_0" / "valid" / "sample02.oem"
+    contents = sample.read_text()
+    anchor = "EPOCH = 1996-12-18T21:29:07.267"
+    assert anchor in contents
+    file_path = tmp_path / "unspaced.oem"
+    file_path.write_text(contents.replace(anchor, anchor.replace(" = ", "=")))
+    with pytest.raises(ValueError, match="Invalid covariance header"):
+        OrbitEphemerisMessage.open(file_path)
 
-        converted_kvn_path = Path(tmp_dir) / "written.oem"
-        OrbitEphemerisMessage.convert(converted_xml_path, converted_kvn_path, "xml")
-        converted_kvn = OrbitEphemerisMessage.open(converted_kvn_path)
 
-        assert converted_xml == converted_kvn
+@pytest.mark.parametrize("file_path", _get_test_files(validity="valid"))
+def test_convert(file_path, oem_loader, round_trip):
+    converted_kvn = round_trip(oem_loader(file_path), "kvn")
+    converted_xml = round_trip(converted_kvn, "xml")
+    assert converted_xml == converted_kvn
 
 
 def test_compare():
@@ -72,18 +102,71 @@ def test_compare():
 
 
 @pytest.mark.parametrize("file_path", _get_test_files(validity="valid"))
-def test_copy(file_path):
-    oem1 = OrbitEphemerisMessage.open(file_path)
+def test_copy(file_path, oem_loader):
+    oem1 = oem_loader(file_path)
     oem2 = oem1.copy()
     assert oem1 is not oem2 and oem1 == oem2
 
 
+def test_weakref(oem_loader):
+    oem = oem_loader(_get_test_files(validity="valid")[0])
+    assert weakref.ref(oem)() is oem
+
+
+def test_xml_binary_stream(oem_loader):
+    file_path = SAMPLE_DIR / "v2_0" / "valid" / "sample10.oem"
+    with open(file_path, "rb") as xml_file:
+        oem = OrbitEphemerisMessage._from_raw_data(parse_xml_oem(xml_file))
+    assert oem == oem_loader(str(file_path))
+
+
+def test_states_reflect_changes():
+    oem = OrbitEphemerisMessage.open(SAMPLE_DIR / "real" / "GEO_20s.oem")
+    oem.states[0].position[0] += 1.0
+    assert oem.states[0] == next(iter(oem.segments[0]))
+
+    oem.segments[0].metadata["CENTER_NAME"] = "MARS"
+    assert all(state.center == "MARS" for state in oem.states)
+
+    oem.segments[0].resample(600, in_place=True)
+    assert len(oem.states) == len(list(oem.segments[0].states))
+
+
+def test_segment_lookup_reflects_changes():
+    oem = OrbitEphemerisMessage.open(SAMPLE_DIR / "real" / "GEO_20s.oem")
+    segment = oem.segments[0]
+    epoch = segment.useable_stop_time - TimeDelta(60, format="sec")
+    assert epoch in oem
+
+    stop = segment.useable_stop_time - TimeDelta(3600, format="sec")
+    segment.metadata["USEABLE_STOP_TIME"] = stop.isot
+    assert epoch not in oem
+    with pytest.raises(ValueError):
+        oem(epoch)
+
+    segment.metadata["TIME_SYSTEM"] = "TAI"
+    assert segment.useable_start_time.scale == "tai"
+
+
 @pytest.mark.parametrize("compression", ("gzip", "bz2", "lzma"))
-def test_compression(compression):
+def test_compression(compression, oem_loader, tmp_path):
     file_path = _get_test_files(validity="valid")[0]
-    oem = OrbitEphemerisMessage.open(file_path)
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        written_oem_path = Path(tmp_dir) / "written.oem"
-        oem.save_as(written_oem_path, compression=compression)
-        oem_readback = OrbitEphemerisMessage.open(written_oem_path)
-        assert oem == oem_readback
+    oem = oem_loader(file_path)
+    written_oem_path = tmp_path / "written.oem"
+    oem.save_as(written_oem_path, compression=compression)
+    oem_readback = OrbitEphemerisMessage.open(written_oem_path)
+    assert oem == oem_readback
+
+
+def test_segment_lookup():
+    oem = OrbitEphemerisMessage.open(SAMPLE_DIR / "v1_0" / "valid" / "sample02.oem")
+    for segment in oem:
+        for epoch in segment.span:
+            assert epoch in oem
+            assert oem(epoch) == segment(epoch)
+
+    gap_epoch = oem.segments[0].useable_stop_time + TimeDelta(60, format="sec")
+    for epoch in (oem.span[0] - TimeDelta(60, format="sec"), gap_epoch):
+        assert epoch not in oem
+        with pytest.raises(ValueError):
+            oem(epoch)
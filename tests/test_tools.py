@@ -9,8 +9,12 @@ from oem import tools
 def test_parse_integer():
     tools.parse_integer(1, None)
     tools.parse_integer(1.0, None)
+    assert tools.parse_integer("7", None) == 7
+    assert tools.parse_integer("7.0", None) == 7
     with pytest.raises(ValueError):
         tools.parse_integer(1.1, None)
+    with pytest.raises(ValueError):
+        tools.parse_integer("1.1", None)
 
 
 def test_format_epoch():
@@ -19,3 +23,23 @@ def test_format_epoch():
     ) == "2024-02-08T19:46:03.597928"
     assert tools.format_epoch(Time("2024-02-08T19:46:03.597928", precision=6)
                               ) == "2024-02-08T19:46:03.597928"
+
+
+@pytest.mark.parametrize("epoch, expected", [
+    ("2024-02-08T19:46:03", datetime(2024, 2, 8, 19, 46, 3)),
+    ("2024-02-08T19:46:03.5Z", datetime(2024, 2, 8, 19, 46, 3, 500000)),
+    ("2024-02-08T19:46:03.5979281", datetime(2024, 2, 8, 19, 46, 3, 597928)),
+    ("2024-039T19:46:03.597928", datetime(2024, 2, 8, 19, 46, 3, 597928)),
+])
+def test_parse_datetime(epoch, expected):
+    assert tools.parse_datetime(epoch) == expected
+
+
+@pytest.mark.parametrize("epoch", [
+    "2024-02-30T19:46:03",
+    "2024-02-08T19:46:03.",
+    "2024-039T19:46:03.",
+])
+def test_parse_datetime_invalid(epoch):
+    with pytest.raises(ValueError):
+        tools.parse_datetime(epoch)
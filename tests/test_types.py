@@ -1,15 +1,10 @@
 import pytest
 from .test_samples import _get_test_files
-from oem import OrbitEphemerisMessage
-
-
-SAMPLE_FILE = _get_test_files(version='v2_0', validity='valid')[1]
-SAMPLE_FILE_ACCEL = _get_test_files(version='v2_0', validity='valid')[7]
 
 
 @pytest.mark.parametrize("filename", _get_test_files(version='v2_0', validity='valid'))
-def test_state(filename):
-    oem = OrbitEphemerisMessage.open(filename)
+def test_state(filename, oem_loader):
+    oem = oem_loader(filename)
     state = oem.states[0]
 
     assert state == state.copy()
@@ -22,8 +17,8 @@ def test_state(filename):
 
 
 @pytest.mark.parametrize("filename", _get_test_files(version='v2_0', validity='valid'))
-def test_covariance(filename):
-    oem = OrbitEphemerisMessage.open(filename)
+def test_covariance(filename, oem_loader):
+    oem = oem_loader(filename)
     if len(oem.covariances):
         covariance = oem.covariances[0]
         assert covariance == covariance.copy()